@@ -223,29 +223,27 @@ class _WrappedDataLoader:
             yield batch
 
 
-def make_data_loader(
+def flatten_and_check_transitions(
     transitions: AnyTransitions,
     batch_size: int,
-    data_loader_kwargs: Optional[Mapping[str, Any]] = None,
-) -> Iterable[types.TransitionMapping]:
-    """Converts demonstration data to Torch data loader.
+) -> Union[types.TransitionsMinimal, Iterable[types.TransitionMapping]]:
+    """Flattens trajectories into transitions, and checks they fill a batch.
 
     Args:
         transitions: Transitions expressed directly as a `types.TransitionsMinimal`
             object, a sequence of trajectories, or an iterable of transition
             batches (mappings from keywords to arrays containing observations, etc).
-        batch_size: The size of the batch to create. Does not change the batch size
-            if `transitions` is already an iterable of transition batches.
-        data_loader_kwargs: Arguments to pass to `th_data.DataLoader`.
+        batch_size: The size of the batches the transitions will be split into.
 
     Returns:
-        An iterable of transition batches.
+        `transitions` flattened into a `types.Transitions` object if it is an
+        iterable of trajectories. Otherwise, `transitions` itself, or an equivalent
+        fresh iterable if `transitions` is an iterator.
 
     Raises:
-        ValueError: if `transitions` is an iterable over transition batches with batch
-            size not equal to `batch_size`; or if `transitions` is transitions or a
-            sequence of trajectories with total timesteps less than `batch_size`.
-        TypeError: if `transitions` is an unsupported type.
+        ValueError: if `batch_size` is not positive; or if `transitions` is
+            transitions or a sequence of trajectories with total timesteps less than
+            `batch_size`.
     """
     if batch_size <= 0:
         raise ValueError(f"batch_size={batch_size} must be positive.")
@@ -269,6 +267,37 @@ def make_data_loader(
                 f"is smaller than batch size {batch_size}.",
             )
 
+    # Safe to ignore this error since we've already converted Iterable[Trajectory]
+    # `transitions` into Iterable[TransitionMapping]
+    return transitions  # type: ignore[return-value]
+
+
+def make_data_loader(
+    transitions: AnyTransitions,
+    batch_size: int,
+    data_loader_kwargs: Optional[Mapping[str, Any]] = None,
+) -> Iterable[types.TransitionMapping]:
+    """Converts demonstration data to Torch data loader.
+
+    Args:
+        transitions: Transitions expressed directly as a `types.TransitionsMinimal`
+            object, a sequence of trajectories, or an iterable of transition
+            batches (mappings from keywords to arrays containing observations, etc).
+        batch_size: The size of the batch to create. Does not change the batch size
+            if `transitions` is already an iterable of transition batches.
+        data_loader_kwargs: Arguments to pass to `th_data.DataLoader`.
+
+    Returns:
+        An iterable of transition batches.
+
+    Raises:
+        ValueError: if `transitions` is an iterable over transition batches with batch
+            size not equal to `batch_size`; or if `transitions` is transitions or a
+            sequence of trajectories with total timesteps less than `batch_size`.
+        TypeError: if `transitions` is an unsupported type.
+    """
+    transitions = flatten_and_check_transitions(transitions, batch_size)
+    if isinstance(transitions, types.TransitionsMinimal):
         kwargs: Mapping[str, Any] = {
             "shuffle": True,
             "drop_last": True,
@@ -281,8 +310,6 @@ def make_data_loader(
             **kwargs,
         )
     elif isinstance(transitions, Iterable):
-        # Safe to ignore this error since we've already converted Iterable[Trajectory]
-        # `transitions` into Iterable[TransitionMapping]
-        return _WrappedDataLoader(transitions, batch_size)  # type: ignore[arg-type]
+        return _WrappedDataLoader(transitions, batch_size)
     else:
         raise TypeError(f"`demonstrations` unexpected type {type(transitions)}")
@@ -4,11 +4,14 @@ Trains policy by applying supervised learning to a fixed dataset of (observation
 action) pairs generated by some expert demonstrator.
 """
 
+import contextlib
 import dataclasses
+import functools
 import itertools
 from typing import (
     Any,
     Callable,
+    ContextManager,
     Dict,
     Iterable,
     Iterator,
@@ -17,6 +20,7 @@ from typing import (
     Tuple,
     Type,
     Union,
+    cast,
 )
 
 import gymnasium as gym
@@ -77,6 +81,69 @@ class BatchIteratorWithEpochEndCallback:
         return itertools.islice(batch_iterator(), self.n_batches)
 
 
+class _ShuffledTransitionsLoader:
+    """Yields shuffled batches of observations and actions from in-memory transitions.
+
+    A `DataLoader` over `TransitionsMinimal` builds a dictionary for every sample and
+    then collates the samples back into a batch. Here the observations and actions
+    are instead converted to tensors on `device` once, and each batch is gathered
+    there with a single indexing operation per array. When `device` is the policy's
+    device, only the shuffled indices are generated per epoch, and no sample data
+    crosses from host to device during training. The permutation buffer is allocated
+    once and reshuffled in place at the start of every epoch. As with
+    `algo_base.make_data_loader`, incomplete final batches are dropped.
+    """
+
+    def __init__(
+        self,
+        transitions: types.TransitionsMinimal,
+        batch_size: int,
+        device: Union[str, th.device] = "cpu",
+        float_dtype: th.dtype = th.float32,
+    ):
+        """Builds _ShuffledTransitionsLoader.
+
+        Args:
+            transitions: The transitions to draw batches from. Must contain at
+                least `batch_size` transitions; see
+                `algo_base.flatten_and_check_transitions`.
+            batch_size: The number of transitions in each batch.
+            device: The device to hold the transitions on and to gather batches on.
+            float_dtype: The dtype to store floating-point observations and actions
+                as. Integer arrays (e.g. images or discrete actions) are kept as is.
+        """
+
+        def to_device(array: np.ndarray) -> th.Tensor:
+            # Cast once here, rather than the policy casting every batch.
+            is_float = np.issubdtype(array.dtype, np.floating)
+            dtype = float_dtype if is_float else None
+            return util.safe_to_tensor(array, device=device, dtype=dtype)
+
+        self.obs = types.map_maybe_dict(
+            to_device,
+            types.maybe_unwrap_dictobs(transitions.obs),
+        )
+        self.acts = to_device(transitions.acts)
+        self.batch_size = batch_size
+        self._n_batches = len(transitions) // batch_size
+        self._perm = th.empty(len(transitions), dtype=th.int64, device=device)
+
+    def __len__(self) -> int:
+        """Returns the number of batches in each epoch."""
+        return self._n_batches
+
+    def __iter__(self) -> Iterator[types.TransitionMapping]:
+        # Shuffle with torch's global RNG, as `DataLoader` does, so that
+        # `th.manual_seed` determines the batch order.
+        th.randperm(len(self._perm), out=self._perm)
+        for start in range(0, self._n_batches * self.batch_size, self.batch_size):
+            indices = self._perm[start : start + self.batch_size]
+            yield {
+                "obs": types.map_maybe_dict(lambda x: x[indices], self.obs),
+                "acts": self.acts[indices],
+            }
+
+
 @dataclasses.dataclass(frozen=True)
 class BCTrainingMetrics:
     """Container for the different components of behavior cloning loss."""
@@ -135,8 +202,12 @@ class BehaviorCloningLossCalculator:
         log_prob = log_prob.mean()
         entropy = entropy.mean() if entropy is not None else None
 
-        l2_norms = [th.sum(th.square(w)) for w in policy.parameters()]
-        l2_norm = sum(l2_norms) / 2  # divide by 2 to cancel with gradient of square
+        # When unweighted, the L2 norm is only logged: keep it out of the autograd
+        # graph so that backward does not differentiate through every parameter.
+        with th.set_grad_enabled(th.is_grad_enabled() and self.l2_weight != 0):
+            l2_norms = [th.sum(th.square(w)) for w in policy.parameters()]
+            # divide by 2 to cancel with gradient of square
+            l2_norm = sum(l2_norms) / 2
         # sum of list defaults to float(0) if len == 0.
         assert isinstance(l2_norm, th.Tensor)
 
@@ -156,13 +227,37 @@ class BehaviorCloningLossCalculator:
         )
 
 
+def _to_device_async(
+    array: Union[np.ndarray, th.Tensor],
+    device: th.device,
+) -> th.Tensor:
+    """Moves `array` to `device`, letting host-to-GPU copies overlap with compute.
+
+    On CUDA devices, host data is first page-locked so that the copy can be issued
+    with `non_blocking=True`: the host is then free to prepare the next batch while
+    the transfer and the already-queued kernels run on the GPU.
+
+    Args:
+        array: The NumPy array or tensor to move.
+        device: The device to move `array` to.
+
+    Returns:
+        A tensor on `device` with the same content as `array`.
+    """
+    tensor = util.safe_to_tensor(array)
+    if device.type == "cuda" and tensor.device.type == "cpu":
+        tensor = tensor.pin_memory()
+    return tensor.to(device, non_blocking=True)
+
+
 def enumerate_batches(
     batch_it: Iterable[types.TransitionMapping],
 ) -> Iterable[Tuple[Tuple[int, int, int], types.TransitionMapping]]:
     """Prepends batch stats before the batches of a batch iterator."""
     num_samples_so_far = 0
     for num_batches, batch in enumerate(batch_it):
-        batch_size = len(batch["obs"])
+        # Use actions for the size: observations may be a dict of arrays.
+        batch_size = len(batch["acts"])
         num_samples_so_far += batch_size
         yield (num_batches, batch_size, num_samples_so_far), batch
 
@@ -232,8 +327,17 @@ class BCLogger:
         self._logger.record("bc/epoch", self._current_epoch)
         self._logger.record("bc/batch", batch_num)
         self._logger.record("bc/samples_so_far", num_samples_so_far)
-        for k, v in training_metrics.__dict__.items():
-            self._logger.record(f"bc/{k}", float(v) if v is not None else None)
+        metrics = training_metrics.__dict__
+        present = [k for k, v in metrics.items() if v is not None]
+        # Copy all metrics to the host in one transfer, rather than synchronizing
+        # with the device once per metric.
+        device = training_metrics.loss.device
+        values = th.stack(
+            [metrics[k].detach().reshape(()).to(device, th.float32) for k in present],
+        ).tolist()
+        host_metrics = dict(zip(present, values))
+        for k in metrics:
+            self._logger.record(f"bc/{k}", host_metrics.get(k))
 
         for k, v in rollout_stats.items():
             if "return" in k and "monitor" not in k:
@@ -287,6 +391,8 @@ class BC(algo_base.DemonstrationAlgorithm):
         l2_weight: float = 0.0,
         device: Union[str, th.device] = "auto",
         custom_logger: Optional[imit_logger.HierarchicalLogger] = None,
+        mixed_precision: bool = False,
+        demos_on_device: bool = False,
     ):
         """Builds BC.
 
@@ -316,6 +422,17 @@ class BC(algo_base.DemonstrationAlgorithm):
             l2_weight: scaling applied to the policy's L2 regularization.
             device: name/identity of device to place policy on.
             custom_logger: Where to log to; if None (default), creates a new logger.
+            mixed_precision: If True, compute the loss in float16 where it is safe to
+                do so, with dynamic loss scaling to avoid gradient underflow. This
+                roughly halves activation memory traffic and speeds up training on
+                GPUs with half-precision tensor cores. Has no effect unless the
+                policy is on a CUDA device.
+            demos_on_device: If True, demonstrations given as transitions or
+                trajectories are copied to the policy's device once, and batches are
+                gathered there, so that no sample data is copied to the device
+                during training. Only enable this if the demonstrations fit in
+                device memory. If False (default), they are kept in host memory and
+                each batch is copied to the device as it is used.
 
         Raises:
             ValueError: If `weight_decay` is specified in `optimizer_kwargs` (use the
@@ -323,12 +440,16 @@ class BC(algo_base.DemonstrationAlgorithm):
                 of the minibatch size.
         """
         self._demo_data_loader: Optional[Iterable[types.TransitionMapping]] = None
+        self.demos_on_device = demos_on_device
+        self._minibatches_per_epoch: Optional[int] = None
         self.batch_size = batch_size
         self.minibatch_size = minibatch_size or batch_size
         if self.batch_size % self.minibatch_size != 0:
             raise ValueError("Batch size must be a multiple of minibatch size.")
+        # Demonstrations are set once the policy exists, so that they can be placed
+        # on the policy's device.
         super().__init__(
-            demonstrations=demonstrations,
+            demonstrations=None,
             custom_logger=custom_logger,
         )
         self._bc_logger = BCLogger(self.logger)
@@ -368,15 +489,40 @@ class BC(algo_base.DemonstrationAlgorithm):
 
         self.loss_calculator = BehaviorCloningLossCalculator(ent_weight, l2_weight)
 
+        self.mixed_precision = mixed_precision and self.policy.device.type == "cuda"
+        self._grad_scaler: Optional["th.amp.GradScaler"] = None
+        if self.mixed_precision:
+            # `th.amp.GradScaler` supersedes the deprecated `th.cuda.amp.GradScaler`.
+            if hasattr(th.amp, "GradScaler"):
+                self._grad_scaler = th.amp.GradScaler("cuda")
+            else:  # pragma: no cover
+                self._grad_scaler = cast("th.amp.GradScaler", th.cuda.amp.GradScaler())
+
+        if demonstrations is not None:
+            self.set_demonstrations(demonstrations)
+
     @property
     def policy(self) -> policies.ActorCriticPolicy:
         return self._policy
 
     def set_demonstrations(self, demonstrations: algo_base.AnyTransitions) -> None:
-        self._demo_data_loader = algo_base.make_data_loader(
+        demonstrations = algo_base.flatten_and_check_transitions(
             demonstrations,
             self.minibatch_size,
         )
+        if isinstance(demonstrations, types.TransitionsMinimal):
+            self._demo_data_loader = _ShuffledTransitionsLoader(
+                demonstrations,
+                self.minibatch_size,
+                self.policy.device if self.demos_on_device else "cpu",
+            )
+            self._minibatches_per_epoch = len(self._demo_data_loader)
+        else:
+            self._demo_data_loader = algo_base.make_data_loader(
+                demonstrations,
+                self.minibatch_size,
+            )
+            self._minibatches_per_epoch = None
 
     def train(
         self,
@@ -412,7 +558,10 @@ class BC(algo_base.DemonstrationAlgorithm):
                 actions spaces must match `self.observation_space` and
                 `self.action_space`) is used to generate rollout stats, including
                 average return and average episode length. If None, then no rollouts
-                are generated.
+                are generated. Episodes are collected from all of its environments at
+                once, with a single batched policy call per step; pass a
+                `SubprocVecEnv` (e.g. `util.make_vec_env(..., parallel=True)`) to
+                also step the environments in parallel worker processes.
             log_rollouts_n_episodes: Number of rollouts to generate when calculating
                 rollout stats. Non-positive number disables rollouts.
             progress_bar: If True, then show a progress bar during training.
@@ -429,9 +578,10 @@ class BC(algo_base.DemonstrationAlgorithm):
             log_rollouts_n_episodes,
         )
 
+        total_num_epochs_str = f"of {n_epochs}" if n_epochs is not None else ""
+
         def _on_epoch_end(epoch_number: int):
             if tqdm_progress_bar is not None:
-                total_num_epochs_str = f"of {n_epochs}" if n_epochs is not None else ""
                 tqdm_progress_bar.display(
                     f"Epoch {epoch_number} {total_num_epochs_str}",
                     pos=1,
@@ -454,15 +604,23 @@ class BC(algo_base.DemonstrationAlgorithm):
         tqdm_progress_bar: Optional[tqdm.tqdm] = None
 
         if progress_bar:
+            total = n_minibatches
+            if total is None and self._minibatches_per_epoch is not None:
+                assert n_epochs is not None
+                total = n_epochs * self._minibatches_per_epoch
             batches_with_stats = tqdm.tqdm(
                 batches_with_stats,
                 unit="batch",
-                total=n_minibatches,
+                total=total,
             )
             tqdm_progress_bar = batches_with_stats
 
         def process_batch():
-            self.optimizer.step()
+            if self._grad_scaler is not None:
+                self._grad_scaler.step(self.optimizer)
+                self._grad_scaler.update()
+            else:
+                self.optimizer.step()
             self.optimizer.zero_grad()
 
             if batch_num % log_interval == 0:
@@ -479,6 +637,11 @@ class BC(algo_base.DemonstrationAlgorithm):
             if on_batch_end is not None:
                 on_batch_end()
 
+        autocast: Callable[[], ContextManager[Any]] = contextlib.nullcontext
+        if self.mixed_precision:
+            autocast = functools.partial(th.autocast, device_type="cuda")
+        # Bind the conversion once, rather than rebuilding a closure every batch.
+        to_device = functools.partial(_to_device_async, device=self.policy.device)
         self.optimizer.zero_grad()
         for (
             batch_num,
@@ -488,18 +651,22 @@ class BC(algo_base.DemonstrationAlgorithm):
             obs_tensor: Union[th.Tensor, Dict[str, th.Tensor]]
             # unwraps the observation if it's a dictobs and converts arrays to tensors
             obs_tensor = types.map_maybe_dict(
-                lambda x: util.safe_to_tensor(x, device=self.policy.device),
+                to_device,
                 types.maybe_unwrap_dictobs(batch["obs"]),
             )
-            acts = util.safe_to_tensor(batch["acts"], device=self.policy.device)
-            training_metrics = self.loss_calculator(self.policy, obs_tensor, acts)
+            acts = to_device(batch["acts"])
+            with autocast():
+                training_metrics = self.loss_calculator(self.policy, obs_tensor, acts)
 
             # Renormalise the loss to be averaged over the whole
             # batch size instead of the minibatch size.
             # If there is an incomplete batch, its gradients will be
             # smaller, which may be helpful for stability.
             loss = training_metrics.loss * minibatch_size / self.batch_size
-            loss.backward()
+            if self._grad_scaler is not None:
+                self._grad_scaler.scale(loss).backward()
+            else:
+                loss.backward()
 
             batch_num = batch_num * self.minibatch_size // self.batch_size
             if num_samples_so_far % self.batch_size == 0:
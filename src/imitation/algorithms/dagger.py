@@ -17,7 +17,6 @@ import numpy as np
 import torch as th
 from stable_baselines3.common import policies, utils, vec_env
 from stable_baselines3.common.vec_env.base_vec_env import VecEnvStepReturn
-from torch.utils import data as th_data
 
 from imitation.algorithms import base, bc
 from imitation.data import rollout, serialize, types
@@ -421,7 +420,7 @@ class DAggerTrainer(base.BaseImitationAlgorithm):
         return self.scratch_dir / "demos" / f"round-{round_num:03d}"
 
     def _try_load_demos(self) -> None:
-        """Load the dataset for this round into self.bc_trainer as a DataLoader."""
+        """Load the dataset for this round into self.bc_trainer."""
         demo_dir = self._demo_dir_path_for_round()
         demo_paths = self._get_demo_paths(demo_dir) if demo_dir.is_dir() else []
         if len(demo_paths) == 0:
@@ -442,14 +441,9 @@ class DAggerTrainer(base.BaseImitationAlgorithm):
                     f"self.batch_size={self.batch_size} > "
                     f"len(transitions)={len(transitions)}",
                 )
-            data_loader = th_data.DataLoader(
-                transitions,
-                self.batch_size,
-                drop_last=True,
-                shuffle=True,
-                collate_fn=types.transitions_collate_fn,
-            )
-            self.bc_trainer.set_demonstrations(data_loader)
+            # Hand over the transitions themselves rather than a `DataLoader`, so
+            # that BC keeps them resident for every epoch of training.
+            self.bc_trainer.set_demonstrations(transitions)
             self._last_loaded_round = self.round_num
 
     def extend_and_update(
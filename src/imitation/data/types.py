@@ -253,7 +253,8 @@ def maybe_unwrap_dictobs(maybe_dictobs):
     if isinstance(maybe_dictobs, DictObs):
         return maybe_dictobs.unwrap()
     else:
-        if not isinstance(maybe_dictobs, (np.ndarray, th.Tensor, int)):
+        # Plain dicts, e.g. of tensors, are already unwrapped.
+        if not isinstance(maybe_dictobs, (np.ndarray, th.Tensor, int, dict)):
             warnings.warn(f"trying to unwrap object of type {type(maybe_dictobs)}")
         return maybe_dictobs
 
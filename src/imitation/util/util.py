@@ -5,6 +5,7 @@ import functools
 import itertools
 import os
 import pathlib
+import pickle
 import uuid
 import warnings
 from typing import (
@@ -38,7 +39,13 @@ def save_policy(policy: policies.BasePolicy, policy_path: AnyPath) -> None:
         policy: policy to save.
         policy_path: path to save policy to.
     """
-    th.save(policy, parse_path(policy_path))
+    # Parameters are stored as raw storages in the archive either way; a newer
+    # pickle protocol than torch's default (2) speeds up the policy object itself.
+    th.save(
+        policy,
+        parse_path(policy_path),
+        pickle_protocol=pickle.HIGHEST_PROTOCOL,
+    )
 
 
 def oric(x: np.ndarray) -> np.ndarray:
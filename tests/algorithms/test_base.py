@@ -1,10 +1,11 @@
 """Tests for imitation.algorithms.base."""
 
+import gymnasium as gym
 import numpy as np
 import pytest
 import torch as th
 
-from imitation.algorithms import base
+from imitation.algorithms import base, bc
 from imitation.data import types
 
 
@@ -85,6 +86,24 @@ def test_make_data_loader_batch_size():
             base.make_data_loader(trans, batch_size=larger_bs)
 
 
+def test_bc_batch_size_validation():
+    """Tests BC performs the same batch size validation as the data loader."""
+    trans = types.TransitionsMinimal(
+        obs=np.zeros((5, 2), dtype=np.float32),
+        acts=np.zeros((5, 1), dtype=np.float32),
+        infos=np.array([{}] * 5),
+    )
+    for batch_size in [-1, -32]:
+        with pytest.raises(ValueError, match=".*must be positive"):
+            bc.BC(
+                observation_space=gym.spaces.Box(-np.inf, np.inf, shape=(2,)),
+                action_space=gym.spaces.Box(-1, 1, shape=(1,)),
+                rng=np.random.default_rng(0),
+                batch_size=batch_size,
+                demonstrations=trans,
+            )
+
+
 def test_make_data_loader():
     """Tests data loader produces same results for same input in different formats."""
     trajs = [
@@ -290,7 +290,31 @@ def test_that_policy_reconstruction_preserves_parameters(
         th.testing.assert_close(original, reconstructed)
 
 
-def test_dict_space(multi_obs_venv: vec_env.VecEnv):
+def test_that_transitions_are_reshuffled_into_full_batches(
+    cartpole_expert_trajectories: Sequence[types.TrajectoryWithRew],
+):
+    # GIVEN
+    trans = rollout.flatten_trajectories(cartpole_expert_trajectories)
+    batch_size = 50
+    batch_loader = bc._ShuffledTransitionsLoader(trans, batch_size)
+
+    # WHEN
+    first_epoch = list(batch_loader)
+    second_epoch = list(batch_loader)
+
+    # THEN
+    assert len(batch_loader) == len(trans) // batch_size
+    for batches in (first_epoch, second_epoch):
+        assert len(batches) == len(batch_loader)
+        assert all(len(batch["obs"]) == batch_size for batch in batches)
+        assert all(len(batch["acts"]) == batch_size for batch in batches)
+    # Each epoch is reshuffled.
+    assert not th.equal(first_epoch[0]["obs"], second_epoch[0]["obs"])
+
+
+@pytest.mark.filterwarnings("error:trying to unwrap")
+@pytest.mark.parametrize("demos_on_device", [False, True])
+def test_dict_space(multi_obs_venv: vec_env.VecEnv, demos_on_device: bool):
     # multi-input policy to accept dict observations
     assert isinstance(multi_obs_venv.observation_space, gym.spaces.Dict)
     policy = sb_policies.MultiInputActorCriticPolicy(
@@ -315,11 +339,80 @@ def test_dict_space(multi_obs_venv: vec_env.VecEnv):
         action_space=multi_obs_venv.action_space,
         rng=rng,
         demonstrations=transitions,
+        demos_on_device=demos_on_device,
     )
     # confirm that training works
     bc_trainer.train(n_epochs=1)
 
 
+@pytest.mark.filterwarnings("error:trying to unwrap")
+def test_dict_space_loader_batches(multi_obs_venv: vec_env.VecEnv):
+    assert isinstance(multi_obs_venv.observation_space, gym.spaces.Dict)
+    policy = sb_policies.MultiInputActorCriticPolicy(
+        multi_obs_venv.observation_space,
+        multi_obs_venv.action_space,
+        lambda _: 0.001,
+    )
+    rng = np.random.default_rng()
+    rollouts = rollout.rollout(
+        policy=None,
+        venv=multi_obs_venv,
+        sample_until=rollout.make_sample_until(min_timesteps=None, min_episodes=10),
+        rng=rng,
+        unwrap=True,
+    )
+    transitions = rollout.flatten_trajectories(rollouts)
+    batch_size = 8
+    loss_calculator = bc.BehaviorCloningLossCalculator(ent_weight=1e-3, l2_weight=0.0)
+
+    for batch in bc._ShuffledTransitionsLoader(transitions, batch_size):
+        assert isinstance(batch["obs"], dict)
+        assert batch["obs"].keys() == multi_obs_venv.observation_space.spaces.keys()
+        assert all(len(v) == batch_size for v in batch["obs"].values())
+        # Computing the loss unwraps the observations, which must not warn.
+        loss_calculator(policy, batch["obs"], batch["acts"])
+
+
+def test_mixed_precision_is_noop_on_cpu(
+    cartpole_venv: vec_env.VecEnv,
+    cartpole_expert_trajectories: Sequence[types.TrajectoryWithRew],
+    rng: np.random.Generator,
+):
+    bc_trainer = bc.BC(
+        observation_space=cartpole_venv.observation_space,
+        action_space=cartpole_venv.action_space,
+        demonstrations=cartpole_expert_trajectories,
+        device="cpu",
+        mixed_precision=True,
+        rng=rng,
+    )
+    assert bc_trainer.mixed_precision is False
+    bc_trainer.train(n_epochs=1)
+    for param in bc_trainer.policy.parameters():
+        assert param.dtype == th.float32
+        assert th.isfinite(param).all()
+
+
+@pytest.mark.skipif(not th.cuda.is_available(), reason="requires GPU")
+def test_mixed_precision_training(
+    cartpole_venv: vec_env.VecEnv,
+    cartpole_expert_trajectories: Sequence[types.TrajectoryWithRew],
+    rng: np.random.Generator,
+):  # pragma: no cover
+    bc_trainer = bc.BC(
+        observation_space=cartpole_venv.observation_space,
+        action_space=cartpole_venv.action_space,
+        demonstrations=cartpole_expert_trajectories,
+        device="cuda",
+        mixed_precision=True,
+        rng=rng,
+    )
+    bc_trainer.train(n_epochs=1)
+    for param in bc_trainer.policy.parameters():
+        assert param.dtype == th.float32
+        assert th.isfinite(param).all()
+
+
 #############################################
 # ENSURE EXCEPTIONS ARE THROWN WHEN EXPECTED
 #############################################
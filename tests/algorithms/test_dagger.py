@@ -581,3 +581,48 @@ def test_dagger_not_enough_transitions_error(tmpdir, custom_logger, rng):
     )
     with pytest.raises(ValueError, match="Not enough transitions.*"):
         trainer.extend_and_update()
+
+
+def test_dagger_gradient_accumulation(
+    tmpdir,
+    pendulum_venv,
+    pendulum_expert_policy,
+    pendulum_expert_trajectories: Sequence[TrajectoryWithRew],
+    custom_logger,
+):
+    """Tests that DAgger trains BC at minibatch_size, accumulating to batch_size."""
+    batch_size = 8
+    seed = 42
+
+    def make_trainer(name: str, **bc_kwargs) -> dagger.SimpleDAggerTrainer:
+        torch.manual_seed(seed)
+        rng = np.random.default_rng(seed)
+        bc_trainer = bc.BC(
+            observation_space=pendulum_venv.observation_space,
+            action_space=pendulum_venv.action_space,
+            batch_size=batch_size,
+            custom_logger=custom_logger,
+            rng=rng,
+            **bc_kwargs,
+        )
+        return dagger.SimpleDAggerTrainer(
+            venv=pendulum_venv,
+            scratch_dir=os.path.join(tmpdir, name),
+            bc_trainer=bc_trainer,
+            expert_policy=pendulum_expert_policy,
+            expert_trajs=pendulum_expert_trajectories,
+            custom_logger=custom_logger,
+            rng=rng,
+        )
+
+    trainers = (
+        make_trainer("full_batch"),
+        make_trainer("minibatch", minibatch_size=batch_size // 2),
+    )
+    for trainer in trainers:
+        torch.manual_seed(seed)
+        trainer.extend_and_update(dict(n_batches=2, log_rollouts_venv=None))
+
+    params = zip(trainers[0].policy.parameters(), trainers[1].policy.parameters())
+    for p1, p2 in params:
+        torch.testing.assert_close(p1, p2, atol=1e-5, rtol=1e-5)